@@ -2,28 +2,117 @@
 Scrape the HS3 Z-wave website and collect nodes and edges.
 Initialize a Dash app for visualising the Z-wave network.
 
+Development (single process, scrapes HS3 once at startup):
+    python app.py <ip> <port>
+
+Production (one scraper, several web workers sharing the snapshot cache):
+    python app.py <ip> <port> --scrape-only --interval 300
+    ZWIZ_CACHE=<same cache file> gunicorn --workers 4 'app:wsgi()'
+
 """
 import argparse
+import os
+import tempfile
 import dash
+import flask
 import visdcc
+import dash_core_components as dcc
 import dash_html_components as html
+from dash.dependencies import Input, Output
 import zwiz
 
 # pylint: disable=C0103    # non-snake variable names
 
+DEFAULT_CACHE = os.environ.get(
+    "ZWIZ_CACHE", os.path.join(tempfile.gettempdir(), "zwiz-hs3.html")
+)
+
+
 def main():
     """Main program"""
 
     args = parse_args()
-    ip = args.ip
-    port = args.port
+    cache = zwiz.SnapshotCache(args.cache)
+
+    if args.scrape_only:
+        cache.poll(ip=args.ip, port=args.port, interval=args.interval)
+        return
+
+    # scrape the HS3 website once, and serve it from the dev server
+    cache.scrape(ip=args.ip, port=args.port)
+    app = create_app(cache)
+    app.run_server(debug=True)
+
+
+def wsgi():
+    """
+    WSGI entry point for multi-worker servers, e.g.
+        gunicorn --workers 4 'app:wsgi()'
+
+    The workers only read the snapshot cache given by ZWIZ_CACHE. Run exactly
+    one scraper (python app.py <ip> <port> --scrape-only) to keep it updated.
+
+    """
+    cache = zwiz.SnapshotCache(DEFAULT_CACHE)
+    return create_app(cache).server
+
+
+def create_app(cache):
+    """
+    Create the Dash app serving the network from the snapshot cache.
+
+    Arguments:
+        cache (zwiz.SnapshotCache): The cache holding the current snapshot
+
+    Returns:
+        app (dash.Dash): The app
+
+    """
+    app = dash.Dash(__name__, compress=True)
+
+    # a function as layout is evaluated on each page load, so new
+    # snapshots are picked up without restarting the workers
+    app.layout = lambda: serve_layout(cache)
+
+    # read-only data API for other tools, served from the same snapshot
+    app.server.add_url_rule('/api/<resource>', 'api',
+                            lambda resource: serve_api(cache, resource))
+
+    app.server.after_request(add_etag)
+
+    # highlight the neighborhood, route and dependents of the clicked node
+    app.callback(Output('net', 'data'),
+                 [Input('net', 'selection'), Input('hops', 'value')])(
+                     lambda selection, hops: highlight(cache, selection, hops))
+
+    return app
+
+
+def serve_layout(cache):
+    """Return the layout for the current snapshot"""
+
+    snapshot = cache.derive('visdcc', visdcc_snapshot)
+    data = snapshot[1] if snapshot else {'nodes': [], 'edges': []}
+
+    return html.Div([
+        html.Label('Neighborhood hops'),
+        dcc.Slider(id='hops', min=1, max=4, step=1, value=1,
+                   marks={k: str(k) for k in range(1, 5)}),
+        visdcc.Network(id='net',  # pylint: disable=E1101
+                       data=data,
+                       options=dict(height='800px',
+                                    width='100%',
+                                    nodes=dict(color='Grey'))),
+        ])
+
 
-    # data loading
+def visdcc_snapshot(network):
+    """Return the network with its visdcc data, so both come from one snapshot"""
+    return network, visdcc_data(network)
 
-    # initialize network object and scrape the HS3 website
-    network = zwiz.Network(ip=ip, port=port)
-    df = network.edges_df.copy()
-    df = df[df['type'] == 'neighbor']
+
+def visdcc_data(network):
+    """Create visdcc-friendly nodes and edges from the network"""
 
     # set temporary visual settings on the nodes
     for node_id, node in network.nodes.items():
@@ -34,40 +123,134 @@ def main():
             node.marker_size = '7'
             node.marker_shape = 'dot'
 
-    # create visdcc-friendly nodes and edges
     nodes = []
     for node_id, node in network.nodes.items():
-        if node_id not in [n['id'] for n in nodes]:
-            nodes.append({'id': node.node_id,
-                          'label': node.name[0:10]+'...',
-                          'shape': node.marker_shape,
-                          'size': node.marker_size})
+        nodes.append({'id': node.node_id,
+                      'label': node.name[0:10]+'...',
+                      'shape': node.marker_shape,
+                      'size': node.marker_size})
 
     edges = []
     for _, edge in network.edges.items():
-        if edge.id not in [e['id'] for e in edges]:
-            if edge.type == 'route':
-                edges.append({'id': edge.id,
-                              'from': edge.source.node_id,
-                              'to': edge.target.node_id,
-                              'width': 2})
-
-    # create app
-    app = dash.Dash()
-
-    # define layout
-    app.layout = html.Div([
-        visdcc.Network(id='net',  # pylint: disable=E1101
-                        data={'nodes': nodes, 'edges': edges},
-                        options=dict(height='800px',
-                                     width='100%',
-                                     nodes=dict(color='Grey'))),
-        ])
+        if edge.type == 'route':
+            edges.append({'id': edge.id,
+                          'from': edge.source.node_id,
+                          'to': edge.target.node_id,
+                          'width': 2})
+
+    return {'nodes': nodes, 'edges': edges}
+
+
+def highlight(cache, selection, hops):
+    """
+    Return the visdcc data with the selected node highlighted: its
+    neighborhood within the given number of hops, its route to the
+    central node and the nodes relaying through it.
+
+    """
+    snapshot = cache.derive('visdcc', visdcc_snapshot)
+    if snapshot is None:
+        return {'nodes': [], 'edges': []}
+
+    network, data = snapshot
+    selected = (selection or {}).get('nodes') or []
+    if not selected or selected[0] not in network.nodes:
+        return data
+
+    node_id = selected[0]
+    path = network.path_to_controller(node_id)
+    path_edges = {f"{s}__{t}" for s, t in zip(path, path[1:])}
+    colors = dict.fromkeys(network.ego(node_id, hops or 1), 'LightBlue')
+    colors.update(dict.fromkeys(network.dependents(node_id), 'Salmon'))
+    colors.update(dict.fromkeys(path, 'Orange'))
+    colors[node_id] = 'Red'
+
+    nodes = [dict(node, color=colors[node['id']]) if node['id'] in colors else node
+             for node in data['nodes']]
+    edges = [dict(edge, color='Orange', width=4) if edge['id'] in path_edges else edge
+             for edge in data['edges']]
+    return {'nodes': nodes, 'edges': edges}
+
+
+def serve_api(cache, resource):
+    """
+    Serve a resource of the data API, e.g. /api/nodes?fields=node_id,name
+
+    The payloads are serialized and compressed once per snapshot. Clients can
+    revalidate with If-None-Match, and get gzip with Accept-Encoding.
+
+    """
+    payloads = cache.derive('payloads', zwiz.Payloads)
+    if payloads is None:
+        flask.abort(503, "No snapshot of the network yet")
+
+    fields = flask.request.args.get('fields')
+    fields = [f.strip() for f in fields.split(',') if f.strip()] if fields else None
+
+    try:
+        payload = payloads.get(resource, fields)
+    except KeyError:
+        flask.abort(404, f"Unknown resource {resource}")
+    except ValueError as err:
+        flask.abort(400, str(err))
+
+    if flask.request.accept_encodings['gzip']:
+        body, etag = payload.gzipped, payload.gzip_etag
+    else:
+        body, etag = payload.body, payload.etag
+
+    if etag_matches(payload.etag):
+        return not_modified(etag)
+
+    response = flask.Response(body, mimetype='application/json')
+    if body is payload.gzipped:
+        response.headers['Content-Encoding'] = 'gzip'
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['Vary'] = 'Accept-Encoding'
+    return response
+
+
+def add_etag(response):
+    """
+    Add an ETag to JSON data responses, and answer 304 Not Modified
+    when the client already has the same data (If-None-Match).
+
+    """
+    if (flask.request.method == 'GET'
+            and response.status_code == 200
+            and response.mimetype == 'application/json'
+            and not response.direct_passthrough
+            and 'ETag' not in response.headers):
+        response.add_etag()
+        response.headers.setdefault('Cache-Control', 'no-cache')
+        etag, _ = response.get_etag()
+        if etag_matches(etag):
+            return not_modified(etag)
+    return response
+
+
+def etag_matches(etag):
+    """Check if the client sent etag in If-None-Match"""
+
+    # compressed responses have the encoding appended to the ETag, by
+    # flask-compress ("<etag>:gzip") or by the data API ("<etag>-gzip").
+    # Either is a match, since the client gets the same encoding again.
+    variants = {etag, f"{etag}-gzip"}
+    for tag in flask.request.if_none_match.as_set():
+        if tag.split(':')[0] in variants:
+            return True
+    return False
+
 
+def not_modified(etag):
+    """Return a 304 Not Modified response for etag"""
 
-    # main call
-    if __name__ == '__main__':
-        app.run_server(debug=True)
+    response = flask.Response(status=304)
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['Vary'] = 'Accept-Encoding'
+    return response
 
 
 def parse_args():
@@ -75,6 +258,12 @@ def parse_args():
     parser = argparse.ArgumentParser()
     parser.add_argument('ip')
     parser.add_argument('port')
+    parser.add_argument('--cache', default=DEFAULT_CACHE,
+                        help="Snapshot cache file shared with the web workers")
+    parser.add_argument('--scrape-only', action='store_true',
+                        help="Only scrape HS3 into the cache, do not serve the app")
+    parser.add_argument('--interval', type=int, default=300,
+                        help="Seconds between each scrape with --scrape-only")
     return parser.parse_args()
 
 if __name__ == '__main__':
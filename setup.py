@@ -23,6 +23,7 @@ setup(
     packages = ['zwiz'],
     install_requires=[
         "pandas==1.2.1",
+        "numpy>=1.16.5",
         "dash==1.19.0",
         "dash-core-components==1.15.0",
         "dash-html-components==1.1.2",
@@ -31,6 +32,10 @@ setup(
         "html5lib==1.1",
         "visdcc==0.0.40",
         ],
+    extras_require={
+        "serve": ["gunicorn>=20.1"],
+        "export": ["scipy", "networkx", "python-igraph", "pyarrow"],
+        },
     tests_requires=[
         "pytest>=6.2.2"
         ]
@@ -0,0 +1,96 @@
+"""
+Shared fixtures for the tests.
+
+The HTML page below is a trimmed-down ZWaveWho page, designed to look similar
+to the one produced by the Z-wave plugin in HS3. It contains a header table and
+a nodes table with a central node (1) and four other nodes:
+
+    5:  neighbors 1, 22, 60     route: Direct
+    13: neighbors 1, 22         route: Direct
+    22: neighbors 5, 13, 60     route: 13
+    60: neighbors 5, 22         route: 22 -> 13
+
+Node 60 also has the extended fields (device types and command classes).
+
+"""
+
+import pytest
+
+
+def _node(node_id, name, neighbors, route, extended=""):
+    """Return the HTML for a single node in the nodes table"""
+    return f"""
+    <tr><td rowspan='5'><b><font size='4'>{node_id}</font></b></td><td colspan='10'>
+    <font color='#000080'><b>Full Name: </b></font><a href="/device" target="_blank" >{name}</a>
+    </td><td><font color='#000080'><b>Polling: </b></font>Polling Disabled</td></tr>
+    <tr><td><font color='#000080'><b>Manufacturer: </b></font><br>Some manufacturer</td>
+    <td><font color='#000080'><b>Type:</b></font><br> 0x203</td>
+    <td><font color='#000080'><b>Listens:</b></font><br>Yes</td>
+    <td><font color='#000080'><b>Version: </b></font>4.05 <b>Firmware: </b></font>3.2</td>
+    <td><font color='#000080'><b>Speed:</b></font><br>100Kbps</td></tr>
+    <tr><td><b><font color='#000080'><b>Neighbors: </b></font></b>{neighbors}</td></tr>
+    <tr><td><b><font color='#000080'><b>Last Working Route: </b></font></b>{route}</td></tr>
+    {extended}
+    """
+
+
+EXTENDED = """
+    <tr><td><font color='#000080'><b>Uses Interface: </b></font>UZB1 (1)</td><td colspan='12'>
+    <font color='#000080'><b>Basic Type: </b></font>ROUTING SLAVE, &nbsp;&nbsp;&nbsp;&nbsp;
+    <font color='#000080'><b>Generic Type: </b></font>SWITCH BINARY, &nbsp;&nbsp;&nbsp;&nbsp;
+    <font color='#000080'><b>Specific Type: </b></font>POWER SWITCH BINARY</td></tr>
+    <tr><td class='tablecell'><font color='#000080'><b>Command Classes:</b></font><br>
+    <table><tr><td>&nbsp;&nbsp;</td><td><font color='#0066FF'><b>Supported:</b></font></td>
+    <td colspan='8'>Basic, Switch Binary, Version</td>
+    <tr><td>&nbsp;&nbsp;</td><td><font color='#9933FF'><b>Controlled:</b></font></td>
+    <td colspan='8'>Switch Multilevel</td>
+    <tr><td>&nbsp;&nbsp;</td><td><font color='#0066FF'><b>Supported </b></font>
+    <font color='#E99B00'><b>Secure:</b></font></td><td colspan='8'></td>
+    <tr><td>&nbsp;&nbsp;</td><td><font color='#9933FF'><b>Controlled </b></font>
+    <font color='#FF33CC'><b>Secure:</b></font></td><td colspan='8'>Door Lock</td>
+    </table></td></tr>
+"""
+
+
+def make_page(nodes):
+    """
+    Return a ZWaveWho page for the given nodes.
+
+    Arguments:
+        nodes (list of tuple): (node_id, name, neighbors, route[, extended]) per node,
+            formatted the way HS3 presents them.
+    Returns:
+        html (str): The page as a string.
+
+    """
+    node_rows = "".join(_node(*node) for node in nodes)
+    return f"""
+    <html><body>
+    <table>
+    <tr><td class='tableheader'>Current Z-Wave Networks</td></tr>
+    <tr><td>Network Friendly Name</td><td>HomeID</td><td>Number of Nodes</td>
+    <td>Interface Name</td><td>Interface Model</td><td>Node ID</td></tr>
+    <tr><td>Network E8A1234A</td><td>E8A1234A</td><td>{len(nodes)}</td><td>UZB1</td>
+    <td>Sigma Designs UZB</td><td>1</td></tr>
+    </table>
+    <table>
+    <tr><td class='tableheader' colspan='15'>Node Information for Network E8A1234A</td></tr>
+    {node_rows}
+    </table>
+    </body></html>
+    """
+
+
+NODES = [
+    (1, "Node 1 Z-Wave UZB1", "5, 13", "None"),
+    (5, "Kitchen light", "1, 22, 60", "Direct (100K)"),
+    (13, "Hallway switch", "1, 22", "Direct (100K)"),
+    (22, "Living room dimmer", "5, 13, 60", "13 (100K)"),
+    (60, "Garage plug", "5, 22", "22->13 (40K)", EXTENDED),
+]
+
+
+@pytest.fixture(name="page")
+def fixture_page():
+    """A complete ZWaveWho page as a string"""
+    return make_page(NODES)
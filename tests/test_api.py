@@ -0,0 +1,64 @@
+"""Unit tests of the data API payloads"""
+
+import gzip
+import json
+import pytest
+import zwiz
+
+def test_payloads(page):
+    payloads = zwiz.Payloads(zwiz.Network(html=page))
+
+    payload = payloads.get("header")
+    assert json.loads(payload.body)["NodeID"] == 1
+    assert gzip.decompress(payload.gzipped) == payload.body
+
+    nodes = json.loads(payloads.get("nodes").body)
+    assert [n["node_id"] for n in nodes] == [1, 5, 13, 22, 60]
+    assert nodes[-1]["name"] == "Garage plug"
+    assert nodes[-1]["neighbors"] == [5, 22]
+
+    edges = json.loads(payloads.get("edges").body)
+    assert {"id": "60__22", "source": 60, "target": 22, "type": "route", "weight": 1} in edges
+
+    routes = {r["node_id"]: r for r in json.loads(payloads.get("routes").body)}
+    assert 1 not in routes
+    assert routes[5] == {"node_id": 5, "route": [5, 1], "hops": 1}
+    assert routes[60] == {"node_id": 60, "route": [60, 22, 13, 1], "hops": 3}
+
+    analytics = {a["node_id"]: a for a in json.loads(payloads.get("analytics").body)}
+    assert analytics[1]["hops"] == 0
+    assert analytics[13]["relays_for"] == 2
+    assert analytics[22]["relays_for"] == 1
+    assert analytics[60]["neighbor_count"] == 2
+
+def test_payloads_are_reused(page):
+    payloads = zwiz.Payloads(zwiz.Network(html=page))
+    assert payloads.get("nodes") is payloads.get("nodes")
+    assert payloads.get("nodes", ["name"]) is payloads.get("nodes", ["name"])
+
+    # equal snapshots give equal etags, e.g. in different workers
+    other = zwiz.Payloads(zwiz.Network(html=page))
+    assert other.get("edges").etag == payloads.get("edges").etag
+    assert payloads.get("nodes").etag != payloads.get("nodes", ["name"]).etag
+
+    # the compressed body is another representation, with its own etag
+    payload = payloads.get("nodes")
+    assert payload.gzip_etag != payload.etag
+
+def test_field_selection(page):
+    payloads = zwiz.Payloads(zwiz.Network(html=page))
+
+    nodes = json.loads(payloads.get("nodes", ["node_id", "name"]).body)
+    assert nodes[0] == {"node_id": 1, "name": "Node 1 Z-Wave UZB1"}
+
+    header = json.loads(payloads.get("header", ["HomeID"]).body)
+    assert header == {"HomeID": "E8A1234A"}
+
+    # order and duplicates do not give new payloads
+    payload = payloads.get("nodes", ["node_id", "name"])
+    assert payloads.get("nodes", ["name", "node_id", "name"]) is payload
+
+    with pytest.raises(ValueError):
+        payloads.get("nodes", ["node_id", "password"])
+    with pytest.raises(KeyError):
+        payloads.get("devices")
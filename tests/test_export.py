@@ -0,0 +1,86 @@
+"""Unit tests of the exports to sparse matrices and graph libraries"""
+
+import numpy as np
+import pytest
+import zwiz
+
+@pytest.fixture(name="network")
+def fixture_network(page):
+    return zwiz.Network(html=page)
+
+def test_edge_arrays(network):
+    index = network.index
+    assert len(index.edge_arrays()) == len(network.edges)
+
+    # every neighbor claim, also where a route edge joins the same nodes
+    edges = index.edge_arrays("neighbor")
+    claims = list(zip(edges.source_ids.tolist(), edges.target_ids.tolist()))
+    assert claims == [
+        (5, 1), (5, 22), (5, 60), (13, 1), (13, 22),
+        (22, 5), (22, 13), (22, 60), (60, 5), (60, 22),
+    ]
+
+    edges = index.edge_arrays("route")
+    routes = list(zip(edges.source_ids.tolist(), edges.target_ids.tolist()))
+    assert routes == [(5, 1), (13, 1), (22, 13), (60, 22)]
+    assert edges.ids == ["5__1", "13__1", "22__13", "60__22"]
+
+    with pytest.raises(ValueError):
+        index.edge_arrays("radio")
+
+def test_to_csr(network):
+    pytest.importorskip("scipy")
+    index = network.index
+
+    for layer in ["neighbor", "route", None]:
+        matrix = network.to_csr(layer)
+        edges = index.edge_arrays(layer)
+        assert matrix.shape == (5, 5)
+        assert matrix.nnz == len(edges)
+
+        # the matrix shares the buffers of the index
+        assert np.shares_memory(matrix.indices, edges.target)
+        assert np.shares_memory(matrix.indptr, edges.indptr)
+        assert np.shares_memory(matrix.data, edges.weight)
+
+    assert network.to_csr().nnz == len(network.edges)
+
+    matrix = network.to_csr("route")
+    assert matrix[index.position[60], index.position[22]] == 1
+    assert matrix[index.position[22], index.position[60]] == 0
+
+    matrix = network.to_csr("neighbor")
+    assert matrix[index.position[60], index.position[22]] == 1
+    assert matrix[index.position[13], index.position[1]] == 1
+
+def test_to_networkx(network):
+    pytest.importorskip("networkx")
+    graph = network.to_networkx()
+    assert graph.number_of_nodes() == 5
+    assert graph.number_of_edges() == len(network.edges)
+    assert graph.nodes[60]["name"] == "Garage plug"
+    assert graph.edges[60, 22] == {"type": "route", "weight": 1.0}
+    assert network.to_networkx("route").number_of_edges() == 4
+    assert network.to_networkx("neighbor").edges[60, 22]["type"] == "neighbor"
+
+def test_to_igraph(network):
+    pytest.importorskip("igraph")
+    graph = network.to_igraph("route")
+    assert graph.vcount() == 5
+    assert graph.ecount() == 4
+    assert graph.vs["node_id"] == [1, 5, 13, 22, 60]
+    assert set(graph.es["type"]) == {"route"}
+
+def test_to_arrow(network):
+    pytest.importorskip("pyarrow")
+    table = network.to_arrow()
+    assert table.num_rows == len(network.edges)
+    assert table.column_names == ["id", "source", "target", "type", "weight"]
+
+    # the numeric columns share the buffers of the index
+    edges = network.index.edge_arrays()
+    assert np.shares_memory(table.column("source").chunk(0).to_numpy(), edges.source_ids)
+
+    df = table.to_pandas().set_index("id")
+    assert df.loc["60__22", "type"] == "route"
+    assert df.loc["60__22", "source"] == 60
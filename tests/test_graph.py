@@ -0,0 +1,48 @@
+"""Unit tests of the adjacency index and the node queries on Network"""
+
+import pytest
+import zwiz
+from conftest import make_page
+
+def test_ego(page):
+    network = zwiz.Network(html=page)
+    assert network.ego(60, 0) == [60]
+    assert network.ego(60) == [60, 5, 22]
+    assert network.ego(60, 2) == [60, 5, 22, 1, 13]
+    assert network.ego(60, 10) == [60, 5, 22, 1, 13]
+
+    # neighbor claims are symmetric, the central node gets its neighbors' claims
+    assert network.index.neighbors(1) == [5, 13]
+
+def test_path_to_controller(page):
+    network = zwiz.Network(html=page)
+    assert network.path_to_controller(1) == [1]
+    assert network.path_to_controller(5) == [5, 1]
+    assert network.path_to_controller(22) == [22, 13, 1]
+    assert network.path_to_controller(60) == [60, 22, 13, 1]
+
+def test_dependents(page):
+    network = zwiz.Network(html=page)
+    assert network.dependents(13) == [22, 60]
+    assert network.dependents(22) == [60]
+    assert network.dependents(60) == []
+
+def test_faulty_nodes():
+    page = make_page([
+        (1, "Controller", "5", "None"),
+        (5, "Old node", "1, 99", "99->1 (40K)"),
+        (7, "Lost node", "", "None"),
+    ])
+    network = zwiz.Network(html=page)
+    assert network.ego(5, 2) == [5, 1]
+    assert network.ego(7, 2) == [7]
+    assert network.path_to_controller(5) == []
+    assert network.path_to_controller(7) == []
+
+    with pytest.raises(KeyError):
+        network.ego(99)
+
+def test_index_is_built_once(page):
+    network = zwiz.Network(html=page)
+    assert network.index is network.index
+    assert network.index.node_ids.tolist() == [1, 5, 13, 22, 60]
@@ -0,0 +1,103 @@
+"""Unit tests of the route stability analytics"""
+
+import numpy as np
+import pytest
+import zwiz
+from conftest import make_page, NODES
+
+def _snapshot(changes):
+    """Return a Network like the fixture page, with some nodes replaced"""
+    nodes = [changes.get(node[0], node) for node in NODES]
+    return zwiz.Network(html=make_page([node for node in nodes if node]))
+
+@pytest.fixture(name="history")
+def fixture_history():
+    networks = [
+        _snapshot({}),
+        _snapshot({60: (60, "Garage plug", "5, 22", "5 (40K)")}),
+        _snapshot({60: (60, "Garage plug", "5, 22, 13", "None")}),
+        _snapshot({60: (60, "Garage plug", "5, 22, 13", "22->13 (40K)"),
+                   5: None}),
+    ]
+    return zwiz.History(networks, timestamps=[0, 300, 600, 900])
+
+def test_arrays(history):
+    assert history.node_ids.tolist() == [1, 5, 13, 22, 60]
+    assert history.route_id.shape == (4, 5)
+    assert history.present[:, 1].tolist() == [True, True, True, False]
+
+    # equal routes are interned to the same id, also across nodes
+    routes = history.route_id
+    assert routes[0, 4] == routes[3, 4]
+    assert routes[0, 2] == routes[0, 1]
+    assert history.routes[routes[0, 4]] == (22, 13, 1)
+    assert history.routes[routes[2, 4]] == ()
+    assert history.hops[:, 4].tolist() == [3, 2, 0, 3]
+
+def test_stability(history):
+    stability = history.stability()
+    assert stability.index[0] == 60
+
+    garage = stability.loc[60]
+    assert garage["snapshots"] == 4
+    assert garage["route_changes"] == 3
+    assert garage["empty_route_time"] == 300
+    assert garage["empty_route_fraction"] == pytest.approx(0.25)
+    assert garage["hop_variance"] == pytest.approx(np.var([3, 2, 3]))
+    assert garage["neighbor_changes"] == 1
+    assert garage["neighbor_drift"] == pytest.approx(1 / 3)
+
+    kitchen = stability.loc[5]
+    assert kitchen["snapshots"] == 3
+    assert kitchen["route_changes"] == 0
+    assert kitchen["hop_variance"] == 0
+
+    # the central node has no route of its own
+    assert stability.loc[1, "empty_route_fraction"] == 1
+    assert np.isnan(stability.loc[1, "hop_variance"])
+
+def test_stability_weighted_by_time():
+    networks = [
+        _snapshot({}),
+        _snapshot({60: (60, "Garage plug", "5, 22", "None")}),
+        _snapshot({}),
+    ]
+
+    # an outage after the second snapshot, where the route stays empty
+    history = zwiz.History(networks, timestamps=[0, 300, 3600])
+    assert history.durations.tolist() == [300, 3300, 1800]
+
+    garage = history.stability().loc[60]
+    assert garage["route_changes"] == 2
+    assert garage["empty_route_time"] == 3300
+    assert garage["empty_route_fraction"] == pytest.approx(3300 / 5400)
+
+    with pytest.raises(ValueError):
+        zwiz.History(networks, timestamps=[0, 600, 300])
+
+def test_from_files(tmp_path, page):
+    paths = []
+    for i in range(3):
+        path = tmp_path / f"ZWaveWho_{i}.html"
+        path.write_text(page, encoding="utf-8")
+        paths.append(str(path))
+
+    history = zwiz.History.from_files(paths)
+    assert history.timestamps.dtype.kind == "M"
+    assert history.durations.dtype == np.float64
+    assert history.stability()["route_changes"].sum() == 0
+
+    with pytest.raises(ValueError):
+        zwiz.History.from_files(paths, timestamps=[0])
+
+def test_faulty_route_is_no_route():
+    page = make_page([
+        (1, "Controller", "5", "None"),
+        (5, "Old node", "1", "99->1 (40K)"),
+    ])
+    network = zwiz.Network(html=page)
+    history = zwiz.History([network])
+
+    assert network.path_to_controller(5) == []
+    assert history.routes[history.route_id[0, 1]] == ()
+    assert history.stability().loc[5, "empty_route_fraction"] == 1
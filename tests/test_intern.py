@@ -0,0 +1,74 @@
+"""Unit tests of the interning shared between networks"""
+
+import zwiz
+
+def test_shared_between_networks(page):
+    interner = zwiz.Interner()
+    first = zwiz.Network(html=page, interner=interner)
+    second = zwiz.Network(html=page, interner=interner)
+
+    assert first.nodes[60] is not second.nodes[60]
+    assert first.nodes[60].neighbors == (5, 22)
+    assert first.nodes[60].neighbors is second.nodes[60].neighbors
+    assert first.nodes[60].last_working_route is second.nodes[60].last_working_route
+    assert first.nodes[60].name is second.nodes[60].name
+
+    assert first.edges.keys() == second.edges.keys()
+    for edge_id, edge in first.edges.items():
+        assert second.edges[edge_id] is edge
+
+def test_interned_network_works_as_before(page):
+    plain = zwiz.Network(html=page)
+    interned = zwiz.Network(html=page, interner=zwiz.Interner())
+
+    assert interned.edges.keys() == plain.edges.keys()
+    assert interned.edges["60__22"].type == "route"
+    assert interned.edges_df.equals(plain.edges_df)
+    assert interned.path_to_controller(60) == plain.path_to_controller(60)
+    assert interned.ego(60, 2) == plain.ego(60, 2)
+
+    # canonical edges refer to bare nodes, look up the snapshot's node by id
+    source = interned.edges["60__22"].source
+    assert interned.nodes[source.node_id].name == "Garage plug"
+
+def test_only_changes_are_new(page):
+    interner = zwiz.Interner()
+    zwiz.Network(html=page, interner=interner)
+    size = len(interner)
+
+    zwiz.Network(html=page, interner=interner)
+    assert len(interner) == size
+
+    changed = page.replace("22->13 (40K)", "5 (40K)")
+    network = zwiz.Network(html=changed, interner=interner)
+    assert network.nodes[60].last_working_route == (5,)
+    assert len(interner) > size
+
+    interner.clear()
+    assert len(interner) == 0
+    assert network.edges["60__5"].type == "route"
+
+def test_retain_evicts_dropped_snapshots(page):
+    interner = zwiz.Interner()
+    old = zwiz.Network(html=page.replace("22->13 (40K)", "5 (40K)"), interner=interner)
+    kept = zwiz.Network(html=page, interner=interner)
+    size = len(interner)
+
+    interner.retain([kept])
+    assert len(interner) < size
+    assert old.nodes[60].last_working_route == (5,)
+
+    # new snapshots still share values with the kept ones
+    new = zwiz.Network(html=page, interner=interner)
+    assert new.nodes[60].last_working_route is kept.nodes[60].last_working_route
+    assert new.nodes[60].name is kept.nodes[60].name
+    assert new.edges["60__22"] is kept.edges["60__22"]
+
+    interner.retain([])
+    assert len(interner) == 0
+
+def test_keep_html(page):
+    network = zwiz.Network(html=page, keep_html=False)
+    assert network.html is None
+    assert network.nodes[60].raw_html is None
+    assert network.nodes[60].command_classes == {}
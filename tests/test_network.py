@@ -0,0 +1,53 @@
+"""Unit tests of the Network built from a complete page"""
+
+import re
+import zwiz
+
+def test_network(page):
+    network = zwiz.Network(html=page)
+    assert network.node_id == 1
+    assert network.number_of_nodes == 5
+    assert network.home_id == "E8A1234A"
+    assert network.nodes[60].neighbors == [5, 22]
+    assert network.nodes[60].last_working_route == [22, 13]
+
+def test_extended_fields_are_lazy(page):
+    network = zwiz.Network(html=page)
+    node = network.nodes[60]
+
+    # nothing is parsed until an extended field is accessed
+    assert "extended" not in vars(node)
+    assert node.generic_type == "SWITCH BINARY"
+    assert "extended" in vars(node)
+    assert node.extended is node.extended
+
+    assert node.command_classes == {
+        "Supported": ["Basic", "Switch Binary", "Version"],
+        "Controlled": ["Switch Multilevel"],
+        "Supported Secure": [],
+        "Controlled Secure": ["Door Lock"],
+    }
+
+    # the blocks of the other nodes do not leak into each other
+    node = network.nodes[22]
+    assert node.name == "Living room dimmer"
+    assert "Living room dimmer" in node.raw_html
+    assert "Garage plug" not in node.raw_html
+    assert node.polling == "Polling Disabled"
+    assert node.basic_type is None
+    assert node.command_classes == {}
+
+def test_extended_fields_with_upper_case_tags(page):
+    page = re.sub(r"</?\w+", lambda match: match.group(0).upper(), page)
+    network = zwiz.Network(html=page)
+    node = network.nodes[60]
+    assert node.raw_html.startswith("<TR>")
+    assert node.generic_type == "SWITCH BINARY"
+    assert node.command_classes["Controlled Secure"] == ["Door Lock"]
+
+def test_last_block_ends_with_nodes_table(page):
+    network = zwiz.Network(html=page)
+    raw_html = network.nodes[60].raw_html
+    assert "Door Lock" in raw_html
+    assert "</body>" not in raw_html
+    assert raw_html.rstrip().endswith("</table></td></tr>")
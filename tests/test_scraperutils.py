@@ -98,6 +98,26 @@ def test_get_nodes():
     assert node.last_working_route == [22,13]
     assert node.node_id == 60
 
+    # without the page, extended fields are not available
+    assert node.raw_html is None
+    assert node.basic_type is None
+    assert node.command_classes == {}
+
+    # with the page, extended fields are parsed from the node's block
+    node = Scrapers._get_nodes(soup, html)[60]
+    assert node.raw_html.startswith("<tr><td><b><font size='4'>60</font>")
+    assert node.uses_interface == "UZB1 (1)"
+    assert node.polling == "Polling Disabled"
+    assert node.basic_type == "ROUTING SLAVE"
+    assert node.generic_type == "SWITCH BINARY"
+    assert node.specific_type == "POWER SWITCH BINARY"
+    assert node.command_classes == {
+        "Supported": ["vdfvf"],
+        "Controlled": ["Switch Multilevel"],
+        "Supported Secure": [],
+        "Controlled Secure": ["xvdfvd"],
+    }
+
 def test_find_pair():
     html = """
         <some><html>key:</some></html><some>value</close>
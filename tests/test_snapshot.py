@@ -0,0 +1,128 @@
+"""Unit tests of the snapshot cache"""
+
+import os
+import pytest
+from zwiz import SnapshotCache, _snapshot
+
+def test_empty_cache(tmp_path):
+    cache = SnapshotCache(str(tmp_path / "snapshot.html"))
+    assert cache.network is None
+    assert cache.version is None
+    assert cache.derive("name", lambda network: network.name) is None
+
+def test_write_and_read(tmp_path, page):
+    path = str(tmp_path / "snapshot.html")
+    SnapshotCache(path).write(page)
+
+    # a separate reader, as in another worker process
+    cache = SnapshotCache(path)
+    network = cache.network
+    assert network.node_id == 1
+    assert sorted(network.nodes) == [1, 5, 13, 22, 60]
+    assert cache.version is not None
+
+    # unchanged file gives the same network and version
+    version = cache.version
+    assert cache.network is network
+    assert cache.version == version
+    assert SnapshotCache(path).network is not None
+    assert os.listdir(tmp_path) == ["snapshot.html"]
+
+def test_derive_per_snapshot(tmp_path, page):
+    path = str(tmp_path / "snapshot.html")
+    cache = SnapshotCache(path)
+    cache.write(page)
+
+    calls = []
+    def func(network):
+        calls.append(network)
+        return len(network.nodes)
+
+    assert cache.derive("count", func) == 5
+    assert cache.derive("count", func) == 5
+    assert len(calls) == 1
+
+    # a new snapshot invalidates the derived values
+    version = cache.version
+    cache.write(page.replace("Garage plug", "Garage socket"))
+    os.utime(path, ns=(0, 0))
+    assert cache.derive("count", func) == 5
+    assert len(calls) == 2
+    assert cache.version != version
+
+def test_broken_snapshot_keeps_previous(tmp_path, page):
+    path = str(tmp_path / "snapshot.html")
+    cache = SnapshotCache(path)
+    cache.write(page)
+    network = cache.network
+
+    cache.write("<html>Service unavailable</html>")
+    assert cache.network is network
+
+def test_snapshot_readable_by_all(tmp_path, page):
+    path = str(tmp_path / "snapshot.html")
+    SnapshotCache(path).write(page)
+    assert os.stat(path).st_mode & 0o777 == 0o644
+
+def test_unreadable_snapshot_keeps_previous(tmp_path, page, monkeypatch):
+    path = str(tmp_path / "snapshot.html")
+    cache = SnapshotCache(path)
+    cache.write(page)
+    network = cache.network
+
+    def unreadable(*args, **kwargs):
+        raise PermissionError(13, "Permission denied")
+
+    cache.write(page.replace("Garage plug", "Garage socket"))
+    os.utime(path, ns=(0, 0))
+    monkeypatch.setattr(_snapshot, "open", unreadable, raising=False)
+    assert cache.network is network
+    assert cache.derive("name", lambda network: network.nodes[60].name) == "Garage plug"
+
+    # read once it is readable again
+    monkeypatch.undo()
+    assert cache.network.nodes[60].name == "Garage socket"
+
+def test_poll_survives_broken_pages(tmp_path, page, monkeypatch):
+    path = str(tmp_path / "snapshot.html")
+    cache = SnapshotCache(path)
+
+    # HS3 serves a good page, then a broken one, a truncated one and a good one
+    pages = iter([
+        page,
+        "<html><table><tr></tr></table></html>",
+        page.replace("<td>1</td></tr>", "<td>99</td></tr>"),
+        page.replace("Garage plug", "Garage socket"),
+    ])
+    monkeypatch.setattr(_snapshot, "fetch_html", lambda **kwargs: next(pages))
+
+    class Stop(Exception):
+        """Stop the polling loop"""
+
+    def sleep(_):
+        if cache.network.nodes[60].name == "Garage socket":
+            raise Stop()
+
+    monkeypatch.setattr(_snapshot.time, "sleep", sleep)
+
+    with pytest.raises(Stop):
+        cache.poll(ip="127.0.0.1", port=80, interval=300)
+
+    assert cache.network.nodes[60].name == "Garage socket"
+
+def test_derive_during_refresh(tmp_path, page):
+    path = str(tmp_path / "snapshot.html")
+    cache = SnapshotCache(path)
+    cache.write(page)
+
+    def slow_name(network):
+        # another thread stores and loads a new snapshot meanwhile
+        cache.write(page.replace("Garage plug", "Garage socket"))
+        os.utime(path, ns=(0, 0))
+        assert cache.network is not network
+        return network.nodes[60].name
+
+    assert cache.derive("name", slow_name) == "Garage plug"
+
+    # the value from the old snapshot is not used for the new one
+    assert cache.derive("name", lambda network: network.nodes[60].name) == "Garage socket"
@@ -2,3 +2,8 @@
 
 from ._hs3data import Network
 from ._utils import Scrapers
+from ._graph import GraphIndex, EdgeArrays
+from ._snapshot import SnapshotCache, PARSE_ERRORS
+from ._api import Payloads
+from ._history import History
+from ._intern import Interner
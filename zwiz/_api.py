@@ -0,0 +1,200 @@
+"""
+This module contains the pre-serialized payloads for the read-only data API.
+
+Payloads are built once per snapshot of the network and shared by all requests,
+so that many consumers can read the topology without scraping HS3 themselves.
+
+"""
+
+import gzip
+import hashlib
+import json
+
+# pylint: disable=C0103   # Non-snake variable names
+# pylint: disable=R0903   # Few public methods
+
+RESOURCES = ("header", "nodes", "edges", "routes", "analytics")
+
+NODE_FIELDS = (
+    "node_id",
+    "name",
+    "manufacturer",
+    "type",
+    "listens",
+    "version",
+    "firmware",
+    "speed",
+    "neighbors",
+    "last_working_route",
+)
+
+EDGE_FIELDS = ("id", "source", "target", "type", "weight")
+ROUTE_FIELDS = ("node_id", "route", "hops")
+ANALYTICS_FIELDS = ("node_id", "neighbor_count", "hops", "relays_for")
+
+
+class Payload:
+    """
+    A single serialized response body.
+
+    Attributes:
+        body (bytes): The JSON document
+        gzipped (bytes): The JSON document, gzip compressed
+        etag (str): Hash of the body. Equal for equal bodies, also across processes.
+        gzip_etag (str): ETag of the compressed body. A strong ETag must differ
+            between encodings of the same document.
+
+    """
+
+    def __init__(self, data):
+        """Serialize data (a JSON-compatible object)"""
+        self.body = json.dumps(data, separators=(",", ":")).encode("utf-8")
+        self.gzipped = gzip.compress(self.body, mtime=0)
+        self.etag = hashlib.sha1(self.body).hexdigest()
+        self.gzip_etag = f"{self.etag}-gzip"
+
+
+class Payloads:
+    """
+    The payloads of the data API for one snapshot of the network.
+
+    The full payload of each resource is serialized and compressed when the
+    object is created. Payloads with field selection are serialized on first
+    request, and then reused. Selected fields are always returned in the
+    order of the resource, so the number of payloads is bounded by the
+    number of field combinations, not by how clients order them.
+
+    Resources:
+        header:    The header of the network page
+        nodes:     The nodes, with their scraped attributes
+        edges:     The edges, both neighbor and route
+        routes:    The full route from each node to the central node
+        analytics: Per node statistics, e.g. for how many nodes it relays
+
+    """
+
+    def __init__(self, network):
+        """
+        Initialize the payloads from the network.
+
+        Arguments:
+            network (zwiz.Network): The network to serve
+
+        """
+        self._records = {
+            "header": network.header,
+            "nodes": _nodes(network),
+            "edges": _edges(network),
+            "routes": _routes(network),
+            "analytics": _analytics(network),
+        }
+        self._fields = {
+            "header": tuple(network.header),
+            "nodes": NODE_FIELDS,
+            "edges": EDGE_FIELDS,
+            "routes": ROUTE_FIELDS,
+            "analytics": ANALYTICS_FIELDS,
+        }
+        self._payloads = {}
+
+        for resource in RESOURCES:
+            self.get(resource)
+
+    def get(self, resource: str, fields: list = None):
+        """
+        Return the payload of a resource.
+
+        Arguments:
+            resource (str): One of RESOURCES
+            fields (list of str): Only include these fields of each record, in
+                the order of the resource. All fields are included if not given.
+
+        Returns:
+            payload (Payload): The serialized payload
+        Raises:
+            KeyError: If the resource is unknown.
+            ValueError: If one or more of the fields are unknown.
+
+        """
+        records = self._records[resource]
+        if fields:
+            fields = _normalize(self._fields[resource], fields)
+
+        key = (resource, fields or None)
+        if key not in self._payloads:
+            if fields:
+                records = _select(records, fields)
+            self._payloads[key] = Payload(records)
+        return self._payloads[key]
+
+
+def _normalize(known, fields):
+    """
+    Return the fields without duplicates, in the order of known.
+
+    Raises:
+        ValueError: If one or more of the fields are not known.
+
+    """
+    unknown = [field for field in fields if field not in known]
+    if unknown:
+        raise ValueError(f"Unknown field(s): {', '.join(unknown)}")
+    return tuple(field for field in known if field in fields)
+
+
+def _select(records, fields):
+    """Return records (dict or list of dicts) with only the given fields"""
+    if isinstance(records, dict):
+        return {field: records[field] for field in fields}
+    return [{field: record[field] for field in fields} for record in records]
+
+
+def _nodes(network):
+    """Return the nodes as records"""
+    return [
+        {field: getattr(node, field, None) for field in NODE_FIELDS}
+        for node in network.nodes.values()
+    ]
+
+
+def _edges(network):
+    """Return the edges as records"""
+    return [
+        {
+            "id": edge.id,
+            "source": edge.source.node_id,
+            "target": edge.target.node_id,
+            "type": edge.type,
+            "weight": edge.weight,
+        }
+        for edge in network.edges.values()
+    ]
+
+
+def _routes(network):
+    """Return the route for each node (except the central node) as records"""
+    routes = []
+    for node_id in network.nodes:
+        if node_id == network.node_id:
+            continue
+        route = network.path_to_controller(node_id)
+        routes.append({
+            "node_id": node_id,
+            "route": route,
+            "hops": len(route) - 1 if route else None,
+        })
+    return routes
+
+
+def _analytics(network):
+    """Return statistics for each node as records"""
+    analytics = []
+    for node_id, node in network.nodes.items():
+        route = network.path_to_controller(node_id)
+        analytics.append({
+            "node_id": node_id,
+            "neighbor_count": len(getattr(node, "neighbors", [])),
+            "hops": len(route) - 1 if route else None,
+            "relays_for": len(network.dependents(node_id)),
+        })
+    return analytics
@@ -0,0 +1,290 @@
+"""
+This module contains the adjacency index of the Z-wave network.
+
+The index is built once per Network and answers per-node queries (neighborhood,
+route to the central node, nodes relaying through a node) in time proportional
+to the size of the answer, instead of scanning all edges for every query.
+
+It also holds the edges of the network as compact arrays, which the exports to
+sparse matrices and graph libraries are built from.
+
+"""
+
+from itertools import chain
+import numpy as np
+
+# pylint: disable=C0103   # Non-snake variable names
+# pylint: disable=R0902   # Many instances
+# pylint: disable=R0903   # Few public methods
+
+LAYERS = ("neighbor", "route")
+
+
+class GraphIndex:
+    """
+    CSR-style adjacency index of a Network.
+
+    Nodes are numbered by their position in the sorted list of node_ids. For
+    each kind of relation, the related positions of node i are stored in
+    indices[indptr[i]:indptr[i + 1]].
+
+    Attributes:
+        node_ids (numpy.ndarray): The node_ids, sorted. The position of a
+            node_id in this array is its index.
+        position (dict): node_id to index
+        neighbor_indptr, neighbor_indices (numpy.ndarray): The neighbors of
+            each node. Neighbor claims are made symmetric, since a node can
+            reach its neighbors' neighbors in both directions.
+        route_indptr, route_indices (numpy.ndarray): The full route of each
+            node to the central node, including the node itself and the
+            central node. Empty if the node has no valid route.
+        dependent_indptr, dependent_indices (numpy.ndarray): The nodes whose
+            route passes through each node (the reverse of the routes).
+        edges (dict): The edges of the network as EdgeArrays, for each type
+            in LAYERS. Under the key None, one edge per pair of nodes like
+            network.edges, with the route edge where both types join the nodes.
+
+    """
+
+    def __init__(self, network):
+        """
+        Build the index from the network.
+
+        Arguments:
+            network (zwiz.Network): The network to index
+
+        """
+        self.node_ids = np.array(sorted(network.nodes), dtype=np.int64)
+        self.position = {node_id: i for i, node_id in enumerate(self.node_ids.tolist())}
+
+        neighbors = [set() for _ in self.node_ids]
+        for node_id, node in network.nodes.items():
+            i = self.position[node_id]
+            for neighbor in getattr(node, "neighbors", []):
+                # claims of non-existing neighbors are ignored, as for the edges
+                j = self.position.get(neighbor)
+                if j is not None and j != i:
+                    neighbors[i].add(j)
+                    neighbors[j].add(i)
+        self.neighbor_indptr, self.neighbor_indices = _csr(
+            [sorted(n) for n in neighbors]
+        )
+
+        routes = [
+            self._route(network, network.nodes[node_id]) for node_id in self.node_ids.tolist()
+        ]
+        self.route_indptr, self.route_indices = _csr(routes)
+
+        dependents = [[] for _ in self.node_ids]
+        for i, route in enumerate(routes):
+            for relay in route[1:-1]:
+                dependents[relay].append(i)
+        self.dependent_indptr, self.dependent_indices = _csr(dependents)
+
+        self._index_edges(network, routes)
+
+    def _index_edges(self, network, routes):
+        """
+        Store the edges of the network as EdgeArrays, see the class docstring.
+
+        The layers are built from the neighbor claims and routes directly, and
+        not from network.edges, where a route edge replaces the neighbor edge
+        between the same two nodes.
+
+        """
+        layers = {"neighbor": set(), "route": set()}
+        for node_id, node in network.nodes.items():
+            # the central node gives no edges, as for network.edges
+            if node_id == network.node_id:
+                continue
+            i = self.position[node_id]
+            for neighbor in getattr(node, "neighbors", []):
+                j = self.position.get(neighbor)
+                if j is not None:
+                    layers["neighbor"].add((i, j))
+        for route in routes:
+            layers["route"].update(zip(route, route[1:]))
+
+        # separate arrays for each layer, so a layer can be exported without copying
+        self.edges = {
+            layer: EdgeArrays(
+                [self._edge(i, j, code) for i, j in sorted(layers[layer])], self.node_ids
+            )
+            for code, layer in enumerate(LAYERS)
+        }
+
+        # one edge per pair of nodes, the route edge taking the place of the neighbor edge
+        pairs = {}
+        for code, layer in enumerate(LAYERS):
+            pairs.update((pair, code) for pair in layers[layer])
+        self.edges[None] = EdgeArrays(
+            [self._edge(i, j, code) for (i, j), code in sorted(pairs.items())], self.node_ids
+        )
+
+    def _edge(self, i, j, code):
+        """Return the edge tuple for EdgeArrays, all edges have weight 1"""
+        return (i, j, code, 1, f"{self.node_ids[i]}__{self.node_ids[j]}")
+
+    def edge_arrays(self, layer: str = None):
+        """
+        Return the edges of a type.
+
+        Arguments:
+            layer (str): One of LAYERS, or None for one edge per pair of
+                nodes, see the class docstring
+
+        Returns:
+            edges (zwiz.EdgeArrays): The edges
+        Raises:
+            ValueError: If the layer is unknown.
+
+        """
+        if layer not in self.edges:
+            raise ValueError(f"Unknown layer {layer}, must be one of {', '.join(LAYERS)}")
+        return self.edges[layer]
+
+    def _route(self, network, node):
+        """
+        Return the full route of the node to the central node as indices.
+        Routes that are empty or include non-existing nodes give an empty route.
+
+        """
+        if node.node_id == network.node_id:
+            return [self.position[node.node_id]]
+
+        last_working_route = getattr(node, "last_working_route", [])
+        if not last_working_route:
+            return []
+        if any(n not in self.position for n in last_working_route):
+            return []
+
+        if list(last_working_route) == [network.node_id]:
+            route = [node.node_id, network.node_id]
+        else:
+            route = [node.node_id] + list(last_working_route) + [network.node_id]
+        return [self.position[n] for n in route]
+
+    def neighbors(self, node_id: int):
+        """Return the node_ids of the neighbors of the node"""
+        i = self.position[node_id]
+        return self._node_ids(self.neighbor_indices, self.neighbor_indptr, i)
+
+    def ego(self, node_id: int, k: int = 1):
+        """
+        Return the k-hop neighborhood of the node.
+
+        Arguments:
+            node_id (int): The node in the center of the neighborhood
+            k (int): The maximum number of hops from the node
+
+        Returns:
+            node_ids (list of int): The node itself, then the nodes one hop
+                away, then the nodes two hops away, and so on.
+
+        """
+        start = self.position[node_id]
+        seen = {start}
+        order = [start]
+        frontier = [start]
+        indptr, indices = self.neighbor_indptr, self.neighbor_indices
+
+        for _ in range(k):
+            next_frontier = []
+            for i in frontier:
+                for j in indices[indptr[i]:indptr[i + 1]].tolist():
+                    if j not in seen:
+                        seen.add(j)
+                        next_frontier.append(j)
+            if not next_frontier:
+                break
+            order.extend(next_frontier)
+            frontier = next_frontier
+
+        return self.node_ids[order].tolist()
+
+    def path_to_controller(self, node_id: int):
+        """
+        Return the last working route of the node to the central node.
+
+        Returns:
+            node_ids (list of int): The route, starting with the node itself and
+                ending with the central node. Empty if the node has no valid route.
+
+        """
+        i = self.position[node_id]
+        return self._node_ids(self.route_indices, self.route_indptr, i)
+
+    def dependents(self, node_id: int):
+        """
+        Return the nodes relaying through the node to reach the central node.
+
+        Returns:
+            node_ids (list of int): The nodes whose last working route
+                includes the node.
+
+        """
+        i = self.position[node_id]
+        return self._node_ids(self.dependent_indices, self.dependent_indptr, i)
+
+    def _node_ids(self, indices, indptr, i):
+        """Return the node_ids in row i of a CSR structure"""
+        return self.node_ids[indices[indptr[i]:indptr[i + 1]]].tolist()
+
+
+class EdgeArrays:
+    """
+    A set of edges as compact arrays, sorted by source and target. The
+    sources and targets are indices into GraphIndex.node_ids.
+
+    Attributes:
+        source, target (numpy.ndarray): Index of the source and target, as int32
+        source_ids, target_ids (numpy.ndarray): The same, as node_ids
+        layer (numpy.ndarray): The type of each edge as position in LAYERS, as int8
+        weight (numpy.ndarray): The weight of each edge, as float64
+        ids (list of str): The id of each edge
+        indptr (numpy.ndarray): CSR indptr of the edges by source, as int32.
+            The edges from index i are at positions indptr[i]:indptr[i + 1].
+
+    """
+
+    def __init__(self, edges, node_ids):
+        """
+        Initialize the arrays.
+
+        Arguments:
+            edges (list of tuple): (source, target, layer, weight, id) for
+                each edge, sorted by source and target
+            node_ids (numpy.ndarray): The node_ids of the index
+
+        """
+        count = len(edges)
+        self.source = np.fromiter((e[0] for e in edges), dtype=np.int32, count=count)
+        self.target = np.fromiter((e[1] for e in edges), dtype=np.int32, count=count)
+        self.layer = np.fromiter((e[2] for e in edges), dtype=np.int8, count=count)
+        self.weight = np.fromiter((e[3] for e in edges), dtype=np.float64, count=count)
+        self.ids = [e[4] for e in edges]
+        self.source_ids = node_ids[self.source]
+        self.target_ids = node_ids[self.target]
+        self.indptr = np.searchsorted(
+            self.source, np.arange(len(node_ids) + 1)
+        ).astype(np.int32)
+
+    def __len__(self):
+        return len(self.ids)
+
+
+def _csr(rows):
+    """
+    Return the CSR arrays (indptr, indices) for rows of indices.
+
+    Arguments:
+        rows (list of list of int): The indices of each row
+
+    Returns:
+        indptr, indices (tuple of numpy.ndarray)
+
+    """
+    indptr = np.zeros(len(rows) + 1, dtype=np.int64)
+    indptr[1:] = np.cumsum([len(row) for row in rows])
+    indices = np.fromiter(chain.from_iterable(rows), dtype=np.int64, count=indptr[-1])
+    return indptr, indices
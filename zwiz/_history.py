@@ -0,0 +1,285 @@
+"""
+This module contains route stability analytics over many snapshots of the network.
+
+The snapshots are loaded once into columnar arrays (one row per snapshot, one
+column per node), with routes and neighbor lists interned as integer ids. The
+stability metrics are then computed for the whole history at once.
+
+"""
+
+import os
+import numpy as np
+import pandas as pd
+from ._hs3data import Network
+
+# pylint: disable=C0103   # Non-snake variable names
+# pylint: disable=R0902   # Many instances
+
+ABSENT = -1
+
+
+class History:
+    """
+    Class holding the history of the network over many snapshots.
+
+    Routes are stored as the relays and the central node, without the node
+    itself, so that equal routes from different nodes get the same id. The
+    empty route (no last working route) always has id 0.
+
+    Each snapshot is taken to hold until the next one, and the last one for
+    the median interval, so that the metrics are weighted by time and gaps in
+    the history (e.g. scraper outages) do not skew them.
+
+    Attributes:
+        timestamps (numpy.ndarray): The time of each snapshot
+        node_ids (numpy.ndarray): All node_ids seen in any snapshot, sorted
+        route_id (numpy.ndarray): Snapshots x nodes, the id of the route of
+            each node, or ABSENT if the node is not in the snapshot
+        neighbor_id (numpy.ndarray): Snapshots x nodes, the id of the neighbor
+            list of each node, or ABSENT if the node is not in the snapshot
+        routes (list of tuple): The route for each route id
+        neighbors (list of tuple): The neighbor list for each neighbor id
+
+    """
+
+    def __init__(self, networks, timestamps=None):
+        """
+        Load the snapshots into arrays.
+
+        Arguments:
+            networks (iterable of zwiz.Network): The snapshots, in time order.
+                Can be a generator, the networks are not kept.
+            timestamps (list): The time of each snapshot, numbers or
+                datetime64. Defaults to the position of the snapshot.
+        Raises:
+            ValueError: If the timestamps do not match the snapshots,
+                or are not in time order.
+
+        """
+        self.routes = [()]
+        self.neighbors = []
+        self._route_ids = {(): 0}
+        self._neighbor_ids = {}
+        columns = {}
+
+        snapshots = [self._load(network, columns) for network in networks]
+
+        # order the columns by node_id
+        self.node_ids = np.array(sorted(columns), dtype=np.int64)
+        order = np.empty(len(columns), dtype=np.int64)
+        order[[columns[n] for n in self.node_ids.tolist()]] = np.arange(len(columns))
+
+        shape = (len(snapshots), len(columns))
+        self.route_id = np.full(shape, ABSENT, dtype=np.int32)
+        self.neighbor_id = np.full(shape, ABSENT, dtype=np.int32)
+        for t, (positions, routes, neighbors) in enumerate(snapshots):
+            cols = order[positions]
+            self.route_id[t, cols] = routes
+            self.neighbor_id[t, cols] = neighbors
+
+        if timestamps is None:
+            timestamps = np.arange(len(snapshots))
+        self.timestamps = np.asarray(timestamps)
+        if len(self.timestamps) != len(snapshots):
+            raise ValueError("Number of timestamps does not match number of snapshots")
+        if np.any(self.timestamps[1:] < self.timestamps[:-1]):
+            raise ValueError("Timestamps are not in time order")
+
+    def _load(self, network, columns):
+        """
+        Intern the routes and neighbor lists of one snapshot.
+
+        Arguments:
+            network (zwiz.Network): The snapshot
+            columns (dict): node_id to column, new node_ids are added
+
+        Returns:
+            positions, routes, neighbors (tuple of lists): The column, route id
+                and neighbor id of each node in the snapshot
+
+        """
+        positions, routes, neighbors = [], [], []
+        for node_id, node in network.nodes.items():
+            positions.append(columns.setdefault(node_id, len(columns)))
+            routes.append(
+                _intern(self._route_ids, self.routes, _route_key(network, node))
+            )
+            neighbors.append(
+                _intern(self._neighbor_ids, self.neighbors,
+                        tuple(getattr(node, "neighbors", ())))
+            )
+        return positions, routes, neighbors
+
+    @classmethod
+    def from_files(cls, paths, timestamps=None):
+        """
+        Load archived ZWaveWho pages.
+
+        Arguments:
+            paths (list of str): Paths to the saved pages, in time order
+            timestamps (list): The time of each snapshot. Defaults to the
+                modification time of the files.
+
+        Returns:
+            history (zwiz.History): The history
+
+        """
+        paths = list(paths)
+        if timestamps is None:
+            timestamps = np.array(
+                [os.stat(path).st_mtime_ns for path in paths], dtype="datetime64[ns]"
+            )
+
+        def networks():
+            for path in paths:
+                with open(path, encoding="utf-8") as f:
+                    yield Network(html=f.read())
+
+        return cls(networks(), timestamps=timestamps)
+
+    @property
+    def present(self):
+        """Snapshots x nodes, True where the node is in the snapshot"""
+        return self.route_id != ABSENT
+
+    @property
+    def durations(self):
+        """
+        The time each snapshot holds, until the next snapshot. The last snapshot
+        holds for the median interval (1 if there is only one snapshot). In
+        seconds for datetime64 timestamps, else in the unit of the timestamps.
+        """
+        intervals = np.diff(self.timestamps)
+        if intervals.dtype.kind == "m":
+            intervals = intervals / np.timedelta64(1, "s")
+        intervals = intervals.astype(np.float64)
+        if len(self.timestamps) == 0:
+            return intervals
+        last = np.median(intervals) if len(intervals) else 1.0
+        return np.append(intervals, last)
+
+    @property
+    def hops(self):
+        """Snapshots x nodes, the number of hops to the central node (0 if no route)"""
+        route_hops = np.array([len(route) for route in self.routes], dtype=np.int32)
+        return np.where(self.present, route_hops[self.route_id], 0)
+
+    def stability(self):
+        """
+        Compute route stability metrics for each node over the whole history.
+
+        Returns:
+            stability (pandas.DataFrame): One row per node_id, sorted with the
+                least stable nodes (most route changes) first. Columns:
+                snapshots: Number of snapshots the node is in
+                route_changes: Number of times the last working route changed
+                    between consecutive snapshots
+                hop_variance: Time-weighted variance of the number of hops,
+                    over the snapshots where the node has a route
+                empty_route_time: Time without a last working route, in the
+                    unit of durations
+                empty_route_fraction: Fraction of the time the node is in
+                    the history without a last working route
+                neighbor_changes: Number of times the neighbor list changed
+                    between consecutive snapshots
+                neighbor_drift: Average number of neighbors added or removed
+                    between consecutive snapshots
+
+        """
+        present = self.present
+        snapshots = present.sum(axis=0)
+
+        # consecutive snapshots where the node is in both
+        both = present[1:] & present[:-1]
+        transitions = both.sum(axis=0)
+        route_changed = both & (self.route_id[1:] != self.route_id[:-1])
+        neighbors_changed = both & (self.neighbor_id[1:] != self.neighbor_id[:-1])
+
+        hop_variance, empty_route_time, empty_route_fraction = self._route_time(present)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            neighbor_drift = self._neighbor_drift(neighbors_changed) / transitions
+
+        stability = pd.DataFrame(
+            {
+                "snapshots": snapshots,
+                "route_changes": route_changed.sum(axis=0),
+                "hop_variance": np.clip(hop_variance, 0, None),
+                "empty_route_time": empty_route_time,
+                "empty_route_fraction": empty_route_fraction,
+                "neighbor_changes": neighbors_changed.sum(axis=0),
+                "neighbor_drift": neighbor_drift,
+            },
+            index=pd.Index(self.node_ids, name="node_id"),
+        )
+        return stability.sort_values(
+            ["route_changes", "hop_variance"], ascending=False, kind="stable"
+        )
+
+    def _route_time(self, present):
+        """
+        Return the time-weighted hop variance, and the time and fraction of
+        the time without a route, for each node. See stability().
+
+        """
+        durations = self.durations[:, np.newaxis]
+        routed_time = np.where(present & (self.route_id != 0), durations, 0)
+        total_time = np.where(present, durations, 0).sum(axis=0)
+        empty_route_time = total_time - routed_time.sum(axis=0)
+
+        hops = self.hops.astype(np.float64)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = (routed_time * hops).sum(axis=0) / routed_time.sum(axis=0)
+            hop_variance = (routed_time * hops ** 2).sum(axis=0) / routed_time.sum(axis=0)
+            return hop_variance - mean ** 2, empty_route_time, empty_route_time / total_time
+
+    def _neighbor_drift(self, changed):
+        """
+        Return the total number of neighbors added or removed for each node,
+        over the consecutive snapshots marked in changed.
+
+        The size of the change is only computed once for each distinct pair of
+        neighbor lists, which is usually a small number.
+
+        """
+        t, col = np.nonzero(changed)
+        if len(t) == 0:
+            return np.zeros(len(self.node_ids))
+
+        before = self.neighbor_id[t, col].astype(np.int64)
+        after = self.neighbor_id[t + 1, col].astype(np.int64)
+        pairs, inverse = np.unique(
+            before * len(self.neighbors) + after, return_inverse=True
+        )
+
+        sizes = np.array([
+            len(set(self.neighbors[pair // len(self.neighbors)])
+                ^ set(self.neighbors[pair % len(self.neighbors)]))
+            for pair in pairs.tolist()
+        ])
+        return np.bincount(col, weights=sizes[inverse], minlength=len(self.node_ids))
+
+
+def _route_key(network, node):
+    """
+    Return the route of the node as the relays and the central node,
+    or an empty tuple if the node has no valid route. As for the edges,
+    routes including non-existing nodes are not valid.
+
+    """
+    last_working_route = tuple(getattr(node, "last_working_route", ()))
+    if not last_working_route or node.node_id == network.node_id:
+        return ()
+    if any(n not in network.nodes for n in last_working_route):
+        return ()
+    if last_working_route == (network.node_id,):
+        return last_working_route
+    return last_working_route + (network.node_id,)
+
+
+def _intern(ids, values, value):
+    """Return the id of value, adding it to ids and values if it is new"""
+    value_id = ids.get(value)
+    if value_id is None:
+        value_id = ids[value] = len(values)
+        values.append(value)
+    return value_id
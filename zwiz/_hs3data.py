@@ -20,6 +20,8 @@ import requests
 from bs4 import BeautifulSoup
 import pandas as pd
 from ._utils import Scrapers, Edge
+from ._graph import GraphIndex, LAYERS
+from ._intern import Interner
 
 # pylint: disable=C0103   # Non-snake variable names
 # pylint: disable=R0902   # Many instances
@@ -27,24 +29,54 @@ from ._utils import Scrapers, Edge
 
 logging.basicConfig(level=logging.INFO)
 
+
+def fetch_html(ip: str, port: int, page: str = "ZWaveWho"):
+    """
+    Fetch the Z-wave network page from the HS3 website.
+
+    Arguments:
+        ip (str): IP address to the HS3 web administration page
+        port (int): Port used by HS3
+        page (str): The subpage on the HS3 admin site for the Z-wave network
+
+    Returns:
+        html (str): Raw HTML as a string
+    Raises:
+        IOError: If HS3 does not serve the page.
+
+    """
+    url = f"http://{ip}:{port}/{page}"
+    response = requests.get(url, timeout=10)
+    if not response.ok:
+        raise IOError("Could not grab the page from HS3.")
+    return response.text
+
+
 class Network:
     """
     Class for objectifying the Z-wave network overview page served by HS3
 
     Methods:
-        None
+        ego: The k-hop neighborhood of a node
+        path_to_controller: The last working route of a node
+        dependents: The nodes relaying through a node
+        to_csr, to_networkx, to_igraph, to_arrow: Export the edges
     Attributes:
         nodes (list of zwiz.Nodes): A list of the collected Node objects
         edges (pandas.DataFrame): A dataframe with collected edges
+        index (zwiz.GraphIndex): Adjacency index used by the node queries
+        html (str): The page the network was parsed from, None if not kept
 
     """
 
-    def __init__(
+    def __init__(  # pylint: disable=R0913,R0917   # Source of the page and memory options
         self,
         ip: str = None,
         port: int = None,
         html: str = None,
-        page: str = "ZWaveWho"
+        page: str = "ZWaveWho",
+        interner: Interner = None,
+        keep_html: bool = True,
     ):
 
         """
@@ -59,16 +91,18 @@ class Network:
             port (int): Port used by HS3
             page (str): The subpage on the HS3 admin site for the Z-wave network
             html (str): Raw HTML as a string
+            interner (zwiz.Interner): Share neighbor lists, routes and edges with
+                other networks using the same interner. Neighbor lists and routes
+                are then tuples, see zwiz.Interner.
+            keep_html (bool): Keep the page for the extended node fields. When
+                keeping many snapshots in memory, the pages are usually the
+                largest part, so consider turning this off.
 
         """
 
         # When testing, html is passed as a string to create a controlled environment
         if html is None:
-            url = f"http://{ip}:{port}/{page}"
-            response = requests.get(url, timeout=10)
-            if not response.ok:
-                raise IOError("Could not grab the page from HS3.")
-            html = response.text
+            html = fetch_html(ip=ip, port=port, page=page)
 
         # Initialize the BeautifulSoup from the html
         soup = BeautifulSoup(html, "html5lib")
@@ -79,8 +113,17 @@ class Network:
         # get header info from header_table
         self.header = Scrapers._get_header(header_table)
 
+        # keep the page, the nodes refer to it for their extended fields
+        self.html = html if keep_html else None
+
         # get nodes from the nodes_table
-        self.nodes = Scrapers._get_nodes(nodes_table)
+        self.nodes = Scrapers._get_nodes(nodes_table, self.html)
+
+        # share data that is equal to data in other snapshots
+        self._interner = interner
+        if interner is not None:
+            for node in self.nodes.values():
+                interner.intern_node(node)
 
         # Set selected attributes from the header
         self.name = self.header["Network Friendly Name"]
@@ -96,6 +139,63 @@ class Network:
         # Get the edges from the nodes
         self.edges = self._get_edges(self.nodes)
         self._edges_df = None
+        self._index = None
+
+    @property
+    def index(self):
+        """
+        Return the adjacency index of the network, built on first access.
+
+        Returns:
+            index (zwiz.GraphIndex): The adjacency index
+
+        """
+        if self._index is None:
+            self._index = GraphIndex(self)
+        return self._index
+
+    def ego(self, node_id: int, k: int = 1):
+        """
+        Return the k-hop neighborhood of a node in the neighbor graph.
+
+        Arguments:
+            node_id (int): The node in the center of the neighborhood
+            k (int): The maximum number of hops from the node
+
+        Returns:
+            node_ids (list of int): The node itself first, then the other
+                nodes in order of increasing number of hops.
+
+        """
+        return self.index.ego(node_id, k)
+
+    def path_to_controller(self, node_id: int):
+        """
+        Return the last working route of a node to the central node.
+
+        Arguments:
+            node_id (int): The node
+
+        Returns:
+            node_ids (list of int): The route, starting with the node itself and
+                ending with the central node. Empty if the node has no valid route.
+
+        """
+        return self.index.path_to_controller(node_id)
+
+    def dependents(self, node_id: int):
+        """
+        Return the nodes relaying through a node to reach the central node.
+
+        Arguments:
+            node_id (int): The node
+
+        Returns:
+            node_ids (list of int): The nodes whose last working route
+                includes the node.
+
+        """
+        return self.index.dependents(node_id)
 
     @property
     def edges_df(self):
@@ -124,6 +224,122 @@ class Network:
 
         return self._edges_df
 
+    def to_csr(self, layer: str = None):
+        """
+        Return the edges as a sparse adjacency matrix. Row and column i
+        correspond to the node_id self.index.node_ids[i].
+
+        The matrix shares its buffers with the index, so repeated conversions
+        are cheap. Do not modify it in place.
+
+        Arguments:
+            layer (str): "neighbor", "route" or None for one edge per pair of
+                nodes, like self.edges
+
+        Returns:
+            matrix (scipy.sparse.csr_matrix): Edge weights, source as row
+                and target as column.
+
+        """
+        from scipy.sparse import csr_matrix  # pylint: disable=C0415   # optional dependency
+
+        size = len(self.index.node_ids)
+        edges = self.index.edge_arrays(layer)
+        return csr_matrix(
+            (edges.weight, edges.target, edges.indptr), shape=(size, size), copy=False
+        )
+
+    def to_networkx(self, layer: str = None):
+        """
+        Return the network as a directed networkx graph.
+
+        Arguments:
+            layer (str): "neighbor", "route" or None for one edge per pair of
+                nodes, like self.edges
+
+        Returns:
+            graph (networkx.DiGraph): Nodes are node_ids with the attribute
+                "name". Edges have the attributes "type" and "weight".
+
+        """
+        import networkx as nx  # pylint: disable=C0415   # optional dependency
+
+        node_ids = self.index.node_ids.tolist()
+        edges = self.index.edge_arrays(layer)
+
+        graph = nx.DiGraph()
+        graph.add_nodes_from(
+            (node_id, {"name": getattr(self.nodes[node_id], "name", None)})
+            for node_id in node_ids
+        )
+        graph.add_edges_from(
+            (source, target, {"type": LAYERS[code], "weight": weight})
+            for source, target, code, weight in zip(
+                edges.source_ids.tolist(),
+                edges.target_ids.tolist(),
+                edges.layer.tolist(),
+                edges.weight.tolist(),
+            )
+        )
+        return graph
+
+    def to_igraph(self, layer: str = None):
+        """
+        Return the network as a directed igraph graph. Vertex i corresponds
+        to the node_id self.index.node_ids[i].
+
+        Arguments:
+            layer (str): "neighbor", "route" or None for one edge per pair of
+                nodes, like self.edges
+
+        Returns:
+            graph (igraph.Graph): Vertices have the attributes "node_id" and
+                "label" (the node name). Edges have "type" and "weight".
+
+        """
+        import igraph  # pylint: disable=C0415   # optional dependency
+
+        node_ids = self.index.node_ids.tolist()
+        edges = self.index.edge_arrays(layer)
+
+        graph = igraph.Graph(
+            n=len(node_ids),
+            edges=list(zip(edges.source.tolist(), edges.target.tolist())),
+            directed=True,
+        )
+        graph.vs["node_id"] = node_ids
+        graph.vs["label"] = [getattr(self.nodes[n], "name", None) for n in node_ids]
+        graph.es["type"] = [LAYERS[code] for code in edges.layer.tolist()]
+        graph.es["weight"] = edges.weight.tolist()
+        return graph
+
+    def to_arrow(self, layer: str = None):
+        """
+        Return the edges as an Arrow table.
+
+        The numeric columns share their buffers with the index, so repeated
+        conversions are cheap.
+
+        Arguments:
+            layer (str): "neighbor", "route" or None for one edge per pair of
+                nodes, like self.edges
+
+        Returns:
+            table (pyarrow.Table): The columns "id", "source", "target", "type"
+                (dictionary encoded) and "weight", like edges_df.
+
+        """
+        import pyarrow as pa  # pylint: disable=C0415   # optional dependency
+
+        edges = self.index.edge_arrays(layer)
+        return pa.table({
+            "id": pa.array(edges.ids, type=pa.string()),
+            "source": pa.array(edges.source_ids),
+            "target": pa.array(edges.target_ids),
+            "type": pa.DictionaryArray.from_arrays(pa.array(edges.layer), pa.array(LAYERS)),
+            "weight": pa.array(edges.weight),
+        })
+
     def _get_edges(self, nodes):
         """
         From the nodes, extract the edges.
@@ -158,7 +374,7 @@ class Network:
                         neighbor
                     )
                     continue
-                edge = Edge(
+                edge = self._make_edge(
                     source=node, target=nodes[neighbor], edgetype="neighbor", weight=1
                 )
                 edges[edge.id] = edge
@@ -180,14 +396,22 @@ class Network:
             if faulty_route:
                 continue
 
-            if node.last_working_route == [self.node.node_id]:
+            if list(node.last_working_route) == [self.node.node_id]:
                 route = [node, self.node]
             else:
                 route = [node] + [nodes[r] for r in node.last_working_route] + [self.node]
             pairs = [(route[r], route[r + 1]) for r in range(len(route) - 1)]
 
             for source, target in pairs:
-                edge = Edge(source=source, target=target, edgetype="route", weight=1)
+                edge = self._make_edge(
+                    source=source, target=target, edgetype="route", weight=1
+                )
                 edges[edge.id] = edge
 
         return edges
+
+    def _make_edge(self, source, target, edgetype, weight):
+        """Return an Edge, the canonical one if the network uses an interner"""
+        if self._interner is None:
+            return Edge(source=source, target=target, edgetype=edgetype, weight=weight)
+        return self._interner.edge(source.node_id, target.node_id, edgetype, weight)
@@ -0,0 +1,149 @@
+"""
+This module contains the interning of data that repeats between snapshots.
+
+Between consecutive scrapes, nearly all neighbor lists, routes and edges are
+unchanged. When Network instances share an Interner, equal values are stored
+once and shared, so that keeping many snapshots in memory costs roughly the
+size of the changes between them.
+
+"""
+
+from ._utils import Node, Edge
+
+# pylint: disable=C0103   # Non-snake variable names
+
+# string attributes set on the Node objects by the scrapers
+NODE_STRINGS = ("name", "manufacturer", "type", "listens", "version", "firmware", "speed")
+
+
+class Interner:
+    """
+    Hash-consing tables shared between Network instances.
+
+    Values returned by the interner are shared and must not be modified.
+    Neighbor lists and routes are returned as tuples, and edges as canonical
+    Edge objects. The source and target of a canonical edge are bare Node
+    objects holding only the node_id, since the edge is shared by snapshots
+    with different Node objects. Use network.nodes[edge.source.node_id] to
+    get the node of a specific snapshot.
+
+    The tables grow with the number of distinct values seen. When snapshots
+    are dropped, e.g. when a window of snapshots is moved ahead, use retain()
+    with the snapshots still kept to evict the values only the dropped ones
+    used. clear() also empties the tables, but new snapshots then no longer
+    share values with the kept ones.
+
+    """
+
+    def __init__(self):
+        """Initialize empty tables"""
+        self._values = {}
+        self._nodes = {}
+        self._edges = {}
+
+    def __len__(self):
+        """Return the number of interned values"""
+        return len(self._values) + len(self._nodes) + len(self._edges)
+
+    def clear(self):
+        """Empty the tables. Values already handed out stay valid."""
+        self._values.clear()
+        self._nodes.clear()
+        self._edges.clear()
+
+    def retain(self, networks):
+        """
+        Rebuild the tables from the values used by the given networks.
+
+        Values used only by other networks are evicted. The values of the
+        given networks stay canonical, so networks created later still share
+        them.
+
+        Arguments:
+            networks (iterable of zwiz.Network): The networks still kept, all
+                created with this interner
+
+        """
+        values, nodes, edges = {}, {}, {}
+        for network in networks:
+            for node in network.nodes.values():
+                for attribute in ("neighbors", "last_working_route") + NODE_STRINGS:
+                    value = getattr(node, attribute, None)
+                    if value is not None:
+                        values.setdefault(value, value)
+            for edge in network.edges.values():
+                key = (edge.source.node_id, edge.target.node_id, edge.type, edge.weight)
+                edges.setdefault(key, edge)
+                nodes.setdefault(edge.source.node_id, edge.source)
+                nodes.setdefault(edge.target.node_id, edge.target)
+
+        self._values, self._nodes, self._edges = values, nodes, edges
+
+    def value(self, value):
+        """
+        Return the canonical object equal to value.
+
+        Arguments:
+            value (hashable): E.g. a tuple or a string
+
+        Returns:
+            The first interned object equal to value
+
+        """
+        return self._values.setdefault(value, value)
+
+    def neighbors(self, neighbors):
+        """Return the neighbor list as a shared tuple"""
+        return self.value(tuple(neighbors))
+
+    def route(self, route):
+        """Return the route as a shared tuple"""
+        return self.value(tuple(route))
+
+    def node(self, node_id: int):
+        """Return a shared bare Node with only the node_id, used by canonical edges"""
+        if node_id not in self._nodes:
+            self._nodes[node_id] = Node(node_id=node_id)
+        return self._nodes[node_id]
+
+    def edge(self, source_id: int, target_id: int, edgetype: str, weight):
+        """
+        Return the canonical Edge.
+
+        Arguments:
+            source_id, target_id (int): node_id of the source and target
+            edgetype (str): "neighbor" or "route"
+            weight: The weight of the edge
+
+        Returns:
+            edge (Edge): The shared edge
+
+        """
+        key = (source_id, target_id, edgetype, weight)
+        edge = self._edges.get(key)
+        if edge is None:
+            edge = self._edges[key] = Edge(
+                source=self.node(source_id),
+                target=self.node(target_id),
+                edgetype=edgetype,
+                weight=weight,
+            )
+        return edge
+
+    def intern_node(self, node):
+        """
+        Replace the neighbors, last working route and string attributes
+        of the node with shared objects.
+
+        Arguments:
+            node (Node): A node scraped from a snapshot
+
+        """
+        if hasattr(node, "neighbors"):
+            node.neighbors = self.neighbors(node.neighbors)
+        if hasattr(node, "last_working_route"):
+            node.last_working_route = self.route(node.last_working_route)
+        for attribute in NODE_STRINGS:
+            value = getattr(node, attribute, None)
+            if value is not None:
+                setattr(node, attribute, self.value(value))
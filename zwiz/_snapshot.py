@@ -0,0 +1,201 @@
+"""
+This module contains the on-disk snapshot cache shared between processes.
+
+When the app is served by several worker processes, only one process (the
+scraper) should talk to HS3. The scraper writes each fetched page to a cache
+file, and the workers pick up the newest snapshot from that file. This keeps
+the load on HS3 independent of the number of workers and visitors.
+
+"""
+
+import hashlib
+import logging
+import os
+import tempfile
+import threading
+import time
+from ._hs3data import Network, fetch_html
+
+# pylint: disable=C0103   # Non-snake variable names
+
+# errors raised by Network when the page is broken, e.g. during HS3 maintenance
+PARSE_ERRORS = (ValueError, IndexError, KeyError)
+
+
+class SnapshotCache:
+    """
+    Class holding the latest snapshot of the Z-wave network on disk.
+
+    The snapshot is stored as the raw HTML served by HS3. Writing is atomic,
+    so readers never see a partial page. Readers parse the page at most once
+    per snapshot, and anything derived from the network (e.g. serialized data
+    for the web app) can be memoized per snapshot through derive().
+
+    The cache can be shared by threads, e.g. in a threaded web server. The
+    version, network and derived values of a snapshot are replaced together,
+    so a value derived from one snapshot is never stored for another.
+
+    Attributes:
+        path (str): Path to the cache file
+        version (str): Content hash of the current snapshot. The hash is equal
+            across processes reading the same snapshot, so it can be used as an
+            ETag by all workers. None until a snapshot has been loaded.
+
+    """
+
+    def __init__(self, path: str):
+        """
+        Initialize the SnapshotCache.
+
+        Arguments:
+            path (str): Path to the cache file. It is created by write() or
+                scrape(), and does not have to exist beforehand.
+
+        """
+        self.path = path
+        self._stamp = None
+        self._lock = threading.Lock()
+
+        # (version, network, derived values) of the current snapshot
+        self._snapshot = (None, None, {})
+
+    def scrape(self, ip: str, port: int, page: str = "ZWaveWho"):
+        """
+        Fetch the page from HS3 and store it as the current snapshot.
+
+        The page is parsed before it is stored, so that a broken page from HS3
+        does not replace a good snapshot.
+
+        Arguments:
+            ip (str): IP address to the HS3 web administration page
+            port (int): Port used by HS3
+            page (str): The subpage on the HS3 admin site for the Z-wave network
+        Raises:
+            IOError: If HS3 does not serve the page.
+            ValueError, IndexError, KeyError: If the page does not contain
+                the Z-wave network (see PARSE_ERRORS).
+
+        """
+        html = fetch_html(ip=ip, port=port, page=page)
+        Network(html=html)
+        self.write(html)
+
+    def poll(self, ip: str, port: int, interval: float, page: str = "ZWaveWho"):
+        """
+        Scrape HS3 into the cache every interval seconds, forever.
+
+        Failed scrapes are logged and the previous snapshot is kept, so that
+        the scraper survives HS3 being unavailable or serving broken pages.
+
+        Arguments:
+            ip (str): IP address to the HS3 web administration page
+            port (int): Port used by HS3
+            interval (float): Seconds between each scrape
+            page (str): The subpage on the HS3 admin site for the Z-wave network
+
+        """
+        while True:
+            try:
+                self.scrape(ip=ip, port=port, page=page)
+                logging.info("Stored new snapshot in %s", self.path)
+            except (IOError,) + PARSE_ERRORS as err:
+                logging.warning("Could not scrape HS3, keeping previous snapshot: %r", err)
+            time.sleep(interval)
+
+    def write(self, html: str):
+        """
+        Atomically replace the snapshot with the given page.
+
+        The file is readable by all users, so that the workers can read it
+        when the scraper runs as another user.
+
+        Arguments:
+            html (str): Raw HTML as a string
+
+        """
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".zwiz-")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(html)
+            # mkstemp creates the file readable by the owner only
+            os.chmod(tmp_path, 0o644)
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    @property
+    def network(self):
+        """
+        Return the Network for the current snapshot.
+
+        Returns:
+            network (zwiz.Network): The network, or None if no snapshot
+                has been written yet.
+
+        """
+        self._refresh()
+        return self._snapshot[1]
+
+    @property
+    def version(self):
+        """Content hash of the current snapshot, see the class docstring"""
+        return self._snapshot[0]
+
+    def derive(self, name: str, func):
+        """
+        Return func(network) for the current snapshot, memoized per snapshot.
+
+        Arguments:
+            name (str): Name under which the result is memoized
+            func (callable): Function taking a zwiz.Network
+
+        Returns:
+            The result of func(network), or None if there is no snapshot yet.
+
+        """
+        self._refresh()
+
+        # use one snapshot throughout, even if another thread refreshes meanwhile
+        _, network, derived = self._snapshot
+        if network is None:
+            return None
+        if name not in derived:
+            derived[name] = func(network)
+        return derived[name]
+
+    def _refresh(self):
+        """Reload the snapshot if the cache file has changed since last time"""
+        with self._lock:
+            self._reload()
+
+    def _reload(self):
+        """Reload the snapshot, see _refresh()"""
+        try:
+            stat = os.stat(self.path)
+            stamp = (stat.st_mtime_ns, stat.st_size)
+            if stamp == self._stamp:
+                return
+            with open(self.path, encoding="utf-8") as f:
+                html = f.read()
+        except FileNotFoundError:
+            return
+        except OSError as err:
+            # e.g. the file is not readable, retried on the next refresh
+            logging.warning("Could not read snapshot in %s, keeping previous: %r", self.path, err)
+            return
+        self._stamp = stamp
+
+        # the file may have been touched without changing the contents
+        version = hashlib.sha1(html.encode("utf-8")).hexdigest()
+        if version == self.version:
+            return
+
+        try:
+            network = Network(html=html)
+        except PARSE_ERRORS:
+            logging.warning("Could not parse snapshot in %s, keeping previous", self.path)
+            return
+
+        self._snapshot = (version, network, {})
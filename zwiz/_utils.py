@@ -1,6 +1,10 @@
 """This module contains utility classes related to scraping HS3 website"""
 
+import bisect
+import logging
 import re
+from functools import cached_property
+from bs4 import BeautifulSoup
 
 # pylint: disable=C0103   # Non-snake variable names
 # pylint: disable=R0902   # Many instances
@@ -31,6 +35,83 @@ class Node:
 
         self.node_id = node_id
 
+        # handle to the node's block in the retained page, see set_source()
+        self._page = None
+        self._start = None
+        self._end = None
+
+    def set_source(self, page, start, end):
+        """
+        Keep a handle to the block of the page describing this node.
+        The page is not copied, only the offsets of the block are stored.
+
+        Arguments:
+            page (str): The full HTML page
+            start, end (int): Offsets of the node's block in the page
+
+        """
+        self._page = page
+        self._start = start
+        self._end = end
+
+    @property
+    def raw_html(self):
+        """The HTML block describing this node, or None if not available"""
+        if self._page is None:
+            return None
+        return self._page[self._start:self._end]
+
+    @cached_property
+    def extended(self):
+        """
+        Extended fields of the node, parsed from the raw HTML on first access.
+        These are not needed for the network itself, so they are not parsed
+        together with the other fields.
+
+        Returns:
+            extended (dict): See Scrapers.get_extended(). Empty if the raw HTML
+                of the node is not available.
+
+        """
+        if self._page is None:
+            return {}
+        return Scrapers.get_extended(self.raw_html)
+
+    @property
+    def uses_interface(self):
+        """The interface used by the node, e.g. "UZB1 (1)" """
+        return self.extended.get("Uses Interface")
+
+    @property
+    def polling(self):
+        """The polling setting of the node"""
+        return self.extended.get("Polling")
+
+    @property
+    def basic_type(self):
+        """The Z-wave basic device type, e.g. "ROUTING SLAVE" """
+        return self.extended.get("Basic Type")
+
+    @property
+    def generic_type(self):
+        """The Z-wave generic device type, e.g. "SWITCH BINARY" """
+        return self.extended.get("Generic Type")
+
+    @property
+    def specific_type(self):
+        """The Z-wave specific device type, e.g. "POWER SWITCH BINARY" """
+        return self.extended.get("Specific Type")
+
+    @property
+    def command_classes(self):
+        """
+        The command classes of the node, as a dict with the keys "Supported",
+        "Controlled", "Supported Secure" and "Controlled Secure" and lists
+        of command class names as values.
+
+        """
+        return self.extended.get("Command Classes", {})
+
 
 class Edge:
     """
@@ -116,14 +197,18 @@ class Scrapers:
 
 
     @staticmethod
-    def _get_nodes(nodes_table):
+    def _get_nodes(nodes_table, page=None):
         """
             Scrape the nodes table, and return the individual nodes.
             Identify key trs in the table by looking for identifying strings.
             Implicitly, this means that this will fail if key strings occur multiple times.
 
+            If the full page is given, each node keeps a handle to its block in
+            the page, so that extended fields can be parsed later when needed.
+
             Arguments:
                 nodes_table (str): The piece of HMTL containing the nodes table
+                page (str): The full HTML page the nodes table was parsed from
 
             Returns:
                 nodes (dict of node_id:Node): Dictionary with node_id as key, Node object as value
@@ -177,8 +262,119 @@ class Scrapers:
                 last_working_route = Scrapers.get_last_working_route(str(tr))
                 nodes[node_id].last_working_route = last_working_route
 
+        if page is not None:
+            blocks = Scrapers.find_node_blocks(page)
+            if len(blocks) == len(nodes):
+                for node, (start, end) in zip(nodes.values(), blocks):
+                    node.set_source(page, start, end)
+            else:
+                logging.warning(
+                    "Found %s node blocks for %s nodes, extended fields not available",
+                    len(blocks), len(nodes))
+
         return nodes
 
+    @staticmethod
+    def find_node_blocks(html):
+        """
+            Find the block of each node in the raw html. A block starts with the
+            tr containing "Full Name", and ends where the next node starts. The
+            last block ends where the nodes table ends.
+
+            Arguments:
+                html (str): The full HTML page
+
+            Returns:
+                blocks (list of tuple): (start, end) offsets of each block in the
+                    html, in the same order as the nodes in the page.
+
+        """
+        trs = [match.start() for match in re.finditer(r'<tr\b', html, flags=re.IGNORECASE)]
+
+        starts = []
+        for match in re.finditer(r'<b>\s*Full Name', html, flags=re.IGNORECASE):
+            # the last tr before "Full Name"
+            i = bisect.bisect_right(trs, match.start()) - 1
+            if i >= 0:
+                starts.append(trs[i])
+
+        if not starts:
+            return []
+        ends = starts[1:] + [Scrapers.find_table_end(html, starts[-1])]
+        return list(zip(starts, ends))
+
+    @staticmethod
+    def find_table_end(html, pos):
+        """
+            Find the end of the table that position pos is inside of, skipping
+            any tables nested inside it.
+
+            Arguments:
+                html (str): The HTML string
+                pos (int): An offset inside the table
+
+            Returns:
+                end (int): The offset of the closing tag of the table, or the
+                    length of the html if the table is not closed.
+
+        """
+        depth = 1
+        for match in re.compile(r'<(/?)table\b', re.IGNORECASE).finditer(html, pos):
+            depth += -1 if match.group(1) else 1
+            if depth == 0:
+                return match.start()
+        return len(html)
+
+    @staticmethod
+    def get_extended(html):
+        """
+            Parse the extended fields from the html block of a single node.
+
+            Arguments:
+                html (str): The html block of the node
+
+            Returns:
+                extended (dict): The fields "Uses Interface", "Polling", "Basic Type",
+                    "Generic Type" and "Specific Type" as strings (None if not found),
+                    and "Command Classes" as a dict of lists, see get_command_classes()
+
+        """
+        keys = ["Uses Interface", "Polling", "Basic Type", "Generic Type", "Specific Type"]
+        extended = {key: Scrapers.find_pair_value(html, key) for key in keys}
+        extended["Command Classes"] = Scrapers.get_command_classes(html)
+        return extended
+
+    @staticmethod
+    def get_command_classes(html):
+        """
+            Parse the command classes table from the html block of a single node.
+            Each row in the table has a label (e.g. "Supported" or "Controlled Secure")
+            and a comma separated list of command classes.
+
+            Arguments:
+                html (str): The html block of the node, starting with a tr
+
+            Returns:
+                command_classes (dict): Label as key, list of command classes as value
+
+        """
+        soup = BeautifulSoup(f"<table>{html}</table>", "html5lib")
+
+        command_classes = {}
+        for td in soup.find_all('td'):
+            if "Command Classes" not in td.get_text() or td.table is None:
+                continue
+            for tr in td.table.find_all('tr'):
+                tds = tr.find_all('td', recursive=False)
+                if len(tds) < 3:
+                    continue
+                label = " ".join(tds[1].get_text(" ", strip=True).replace(':', '').split())
+                values = tds[2].get_text(strip=True)
+                command_classes[label] = [v.strip() for v in values.split(',') if v.strip()]
+            break
+
+        return command_classes
+
 
     @staticmethod
     def get_last_working_route(tr):